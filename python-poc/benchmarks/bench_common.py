@@ -0,0 +1,33 @@
+# bench_common.py
+# Shared fixtures for the pyperf microbenchmarks. Import this before any src module.
+import contextlib
+import os
+import socket
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import config
+from segment import Segment, SEGMENT_TYPE_DATA
+
+PAYLOAD_SIZES = (10, 100, 1000) # Bytes per segment; 100 is MAX_SEGMENT_PAYLOAD_SIZE
+APP_DATA_SIZES = (100, 1000, 10000) # Bytes per send_data() call
+QUEUE_DEPTHS = (1, 100, 10000)
+
+def make_segment(seq_num, payload_size, priority=config.LOW_PRIORITY):
+    return Segment(type=SEGMENT_TYPE_DATA, priority=priority,
+                   seq_num=seq_num, payload=b"x" * payload_size)
+
+def loopback_sink():
+    """A bound UDP socket nobody reads from; the kernel drops what overflows its buffer."""
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    return sink
+
+@contextlib.contextmanager
+def quiet():
+    """The transports print per segment; keep that out of the terminal but not out of the timing."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
@@ -0,0 +1,24 @@
+# bench_logger.py
+# CSVLogger reopens its file on every event; measure what one event costs each side.
+import os
+import tempfile
+
+import pyperf
+
+import bench_common  # noqa: F401 -- puts src on sys.path
+from logger import CSVLogger
+
+def main():
+    runner = pyperf.Runner()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_logger = CSVLogger(filename_prefix=os.path.join(tmp_dir, "bench"))
+        csv_logger.initialize_sender_log()
+        csv_logger.initialize_receiver_log()
+
+        runner.bench_func("logger_sender_event", csv_logger.log_sender_event,
+                          "SENT_NEW", 42, 1, 100, "LOW_PRIO_BUF", 4, 2, 0, "")
+        runner.bench_func("logger_receiver_event", csv_logger.log_receiver_event,
+                          "DATA_RX", 42, 1, 100, "('127.0.0.1', 12346)", "")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+# bench_segment.py
+# Segment serialization round trip at several payload sizes.
+import pyperf
+
+from bench_common import PAYLOAD_SIZES, make_segment
+from segment import Segment
+
+def main():
+    runner = pyperf.Runner()
+    for size in PAYLOAD_SIZES:
+        segment = make_segment(1, size)
+        data = segment.to_bytes()
+        runner.bench_func(f"segment_to_bytes_{size}B", segment.to_bytes)
+        runner.bench_func(f"segment_from_bytes_{size}B", Segment.from_bytes, data)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# bench_sender.py
+# TransportSender hot paths: send_data, the scheduler dequeue, one transmit, and the retransmission scan.
+# The sender threads are never started; each path is driven directly.
+import time
+
+import pyperf
+
+from bench_common import APP_DATA_SIZES, PAYLOAD_SIZES, QUEUE_DEPTHS, loopback_sink, make_segment, quiet
+import config
+from scheduler import PriorityScheduler
+from transport_sender import TransportSender
+
+def make_sender(sink):
+    return TransportSender(local_ip="127.0.0.1", local_port=0,
+                           remote_ip="127.0.0.1", remote_port=sink.getsockname()[1], profile=False)
+
+def bench_send_data(loops, sender, app_data):
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        sender.send_data(app_data, config.LOW_PRIORITY)
+    elapsed = time.perf_counter() - t0
+    sender.scheduler = PriorityScheduler() # Don't let the queue grow across runs
+    return elapsed
+
+def bench_dequeue(loops, depth, priority):
+    # Pre-fill `loops` extra segments so only the pops are timed and `depth` are always left behind.
+    # For HIGH_PRIORITY a low priority backlog of `depth` also waits underneath, as in a real run.
+    scheduler = PriorityScheduler()
+    for seq in range(depth + loops):
+        scheduler.enqueue(make_segment(seq, 100, priority))
+    if priority == config.HIGH_PRIORITY:
+        for seq in range(depth):
+            scheduler.enqueue(make_segment(seq, 100, config.LOW_PRIORITY))
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        scheduler.dequeue()
+    return time.perf_counter() - t0
+
+def bench_transmit(loops, sender, payload_size):
+    segments = [make_segment(seq, payload_size) for seq in range(loops)]
+    with quiet():
+        t0 = time.perf_counter()
+        for segment in segments:
+            sender._transmit_segment(segment, "LOW_PRIO_BUF")
+        elapsed = time.perf_counter() - t0
+    sender.unacked_segments.clear()
+    sender.in_flight_count = 0
+    return elapsed
+
+def bench_retransmit_timeouts(loops, sender, depth):
+    # Every segment has timed out, so each call re-queues the whole window
+    elapsed = 0.0
+    with quiet():
+        for _ in range(loops):
+            sender.unacked_segments = {seq: (make_segment(seq, 100), 0.0, 0) for seq in range(depth)}
+            sender.scheduler = PriorityScheduler()
+            t0 = time.perf_counter()
+            sender._handle_retransmissions()
+            elapsed += time.perf_counter() - t0
+    return elapsed
+
+def main():
+    runner = pyperf.Runner()
+    sink = loopback_sink()
+    sender = make_sender(sink)
+
+    for size in APP_DATA_SIZES:
+        runner.bench_time_func(f"sender_send_data_{size}B", bench_send_data, sender, b"x" * size)
+
+    for depth in QUEUE_DEPTHS:
+        runner.bench_time_func(f"scheduler_dequeue_low_depth_{depth}", bench_dequeue, depth, config.LOW_PRIORITY)
+        runner.bench_time_func(f"scheduler_dequeue_high_depth_{depth}", bench_dequeue, depth, config.HIGH_PRIORITY)
+
+    for size in PAYLOAD_SIZES:
+        runner.bench_time_func(f"sender_transmit_{size}B", bench_transmit, sender, size)
+
+    for depth in QUEUE_DEPTHS:
+        # Common case: nothing has timed out yet, the scan just walks the window
+        sender.unacked_segments = {seq: (make_segment(seq, 100), float('inf'), 0) for seq in range(depth)}
+        runner.bench_func(f"sender_retransmit_scan_depth_{depth}", sender._handle_retransmissions)
+        runner.bench_time_func(f"sender_retransmit_timeouts_depth_{depth}", bench_retransmit_timeouts, sender, depth)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# compare_backends.py
+# Runs the same prioritized workload over each transport backend on loopback and
+# compares high-priority latency and total throughput.
+#
+#   python3 compare_backends.py --backends udp tcp tcp_parallel --bandwidth 200
+import argparse
+import contextlib
+import io
+import statistics
+import threading
+import time
+
+import bench_common  # noqa: F401 -- puts src on sys.path
+import config
+from transport_backends import BACKENDS, create_sender, create_receiver
+
+class DeliveryRecorder:
+    """Receiver-side callback that timestamps every delivered segment."""
+    def __init__(self):
+        self.arrival_times = {} # {seq_num: arrival_time}
+        self.bytes_received = 0
+        self.last_arrival = None
+        self._lock = threading.Lock()
+
+    def __call__(self, payload, priority, seq_num):
+        now = time.time()
+        with self._lock:
+            self.arrival_times.setdefault(seq_num, now)
+            self.bytes_received += len(payload)
+            self.last_arrival = now
+
+def run_backend(backend, args):
+    recorder = DeliveryRecorder()
+    high_send_times = {} # {seq_num: send_time}, high priority messages fit in a single segment
+    total_bytes = 0
+    low_msg = b"L" * args.low_size
+    high_msg = b"H" * min(args.high_size, config.MAX_SEGMENT_PAYLOAD_SIZE)
+
+    # Transports print per segment; keep that out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        receiver = create_receiver(backend, bandwidth_sps=args.bandwidth)
+        receiver.set_data_callback(recorder)
+        receiver.start()
+        sender = create_sender(backend, bandwidth_sps=args.bandwidth, num_connections=args.connections)
+        sender.start()
+
+        start_time = time.time()
+        try:
+            for _ in range(args.rounds):
+                for _ in range(args.low_burst):
+                    sender.send_data(low_msg, config.LOW_PRIORITY)
+                    total_bytes += len(low_msg)
+                high_send_times[sender.next_seq_num] = time.time()
+                sender.send_data(high_msg, config.HIGH_PRIORITY)
+                total_bytes += len(high_msg)
+                time.sleep(args.interval)
+
+            deadline = time.time() + args.timeout
+            while recorder.bytes_received < total_bytes and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            sender.stop()
+            receiver.stop()
+
+    latencies = [(recorder.arrival_times[seq] - sent) * 1000
+                 for seq, sent in high_send_times.items() if seq in recorder.arrival_times]
+    elapsed = (recorder.last_arrival or time.time()) - start_time
+    return {
+        "backend": backend,
+        "delivered": f"{recorder.bytes_received}/{total_bytes}",
+        "high_p50_ms": statistics.median(latencies) if latencies else float('nan'),
+        "high_max_ms": max(latencies) if latencies else float('nan'),
+        "throughput_kbps": recorder.bytes_received * 8 / 1000 / elapsed if elapsed > 0 else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CATS scheduling across transport backends over loopback.")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--bandwidth", type=float, default=200, help="Bottleneck rate in segments per second (0 disables pacing)")
+    parser.add_argument("--connections", type=int, default=config.PARALLEL_TCP_CONNECTIONS,
+                        help="Connections used by the tcp_parallel backend")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--low-burst", type=int, default=10, help="Low priority messages queued per round")
+    parser.add_argument("--low-size", type=int, default=1000, help="Bytes per low priority message")
+    parser.add_argument("--high-size", type=int, default=50, help="Bytes per high priority message")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between rounds")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for the queues to drain")
+    args = parser.parse_args()
+
+    results = []
+    for backend in args.backends:
+        print(f"Running {backend}...")
+        results.append(run_backend(backend, args))
+        time.sleep(0.5) # Let the ports settle between runs
+
+    print(f"\n{'Backend':<14}{'Delivered':>16}{'High p50 (ms)':>16}{'High max (ms)':>16}{'Throughput (kbit/s)':>22}")
+    for r in results:
+        print(f"{r['backend']:<14}{r['delivered']:>16}{r['high_p50_ms']:>16.1f}{r['high_max_ms']:>16.1f}{r['throughput_kbps']:>22.1f}")
+
+if __name__ == "__main__":
+    main()
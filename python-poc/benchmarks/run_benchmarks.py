@@ -0,0 +1,46 @@
+# run_benchmarks.py
+# Runs every bench_*.py and collects the results into one pyperf JSON file per commit.
+#
+#   python3 run_benchmarks.py --fast
+#   python3 -m pyperf compare_to results/<old>.json results/<new>.json --table
+import argparse
+import glob
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def current_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=BENCH_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the CATS transport microbenchmarks.")
+    parser.add_argument("-o", "--output", help="JSON file to write (default: results/<git revision>.json)")
+    parser.add_argument("-b", "--bench", action="append",
+                        help="Only run this suite, e.g. -b segment (repeatable)")
+    args, pyperf_args = parser.parse_known_args() # Anything else (--fast, --rigorous, ...) goes to pyperf
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"{current_revision()}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    if os.path.exists(output):
+        os.remove(output) # pyperf --append would otherwise mix runs
+
+    scripts = sorted(glob.glob(os.path.join(BENCH_DIR, "bench_*.py")))
+    scripts = [s for s in scripts if os.path.basename(s) != "bench_common.py"]
+    if args.bench:
+        scripts = [s for s in scripts if os.path.basename(s)[len("bench_"):-len(".py")] in args.bench]
+
+    for script in scripts:
+        print(f"--- {os.path.basename(script)} ---")
+        subprocess.run([sys.executable, script, "--append", output] + pyperf_args, cwd=BENCH_DIR, check=True)
+
+    print(f"\nResults saved to {output}")
+    print(f"Compare with: {sys.executable} -m pyperf compare_to <baseline>.json {output} --table")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 # app_receiver.py
 import time
 import datetime
+import signal
 import config
-from transport_receiver import TransportReceiver
+from transport_backends import create_receiver
 from logger import CSVLogger # Add import
 
 READY_FILE_NAME = ".receiver_ready" 
@@ -17,7 +18,12 @@ def handle_received_data(payload: bytes, priority: int, seq_num: int):
 
     print(f"[{timestamp}] [App Receiver] <<<< PRIO:{prio_str} (Seq:{seq_num}) -- Data: {decoded_payload}")
 
+def handle_sigterm(signum, frame):
+    # run_simulation.py stops us with terminate(); unwind so the finally block stops the transport
+    raise SystemExit(0)
+
 def main():
+    signal.signal(signal.SIGTERM, handle_sigterm)
     # log_prefix = "CATS_sim_receiver_app" # Example
     # main_logger = CSVLogger(filename_prefix=log_prefix)
     # Your logger initialization based on your corrected code
@@ -26,11 +32,7 @@ def main():
     # For logger to be instantiated here as per your fixed structure:
     main_logger = CSVLogger(filename_prefix="CATS_sim_receiver_app")
 
-    receiver_transport = TransportReceiver(
-        logger=main_logger, 
-        remote_ip=config.RECEIVER_IP, # Assuming these are defined in config.py
-        remote_port_ack=config.SENDER_PORT # Assuming these are defined in config.py
-    )
+    receiver_transport = create_receiver(config.TRANSPORT_BACKEND, logger=main_logger)
     receiver_transport.set_data_callback(handle_received_data)
     
     try:
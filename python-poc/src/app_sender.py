@@ -1,12 +1,18 @@
 # app_sender.py
 import time
+import signal
 import config
-from transport_sender import TransportSender
+from transport_backends import create_sender
 from logger import CSVLogger # Add import
 
+def handle_sigterm(signum, frame):
+    # run_simulation.py stops us with terminate(); unwind so the finally block stops the transport
+    raise SystemExit(0)
+
 def main():
+    signal.signal(signal.SIGTERM, handle_sigterm)
     main_logger = CSVLogger(filename_prefix=f"{config.LOG_PREFIX}_sender_app") # For sender
-    sender_transport = TransportSender(logger=main_logger) # Pass logger
+    sender_transport = create_sender(config.TRANSPORT_BACKEND, logger=main_logger) # Pass logger
     sender_transport.start()
 
     print("Application Sender starting...")
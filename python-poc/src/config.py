@@ -22,5 +22,16 @@ SENDER_LOOP_INTERVAL = 0.05
 ACK_TIMEOUT = 0.5 # Seconds
 MAX_RETRIES = 2
 
+# --- Transport Backend ---
+# "udp" (CATS reliability layer), "tcp" (single FIFO connection) or "tcp_parallel"
+TRANSPORT_BACKEND = "udp"
+PARALLEL_TCP_CONNECTIONS = 4
+# Kept small so the kernel buffers don't hide the bottleneck from the scheduler
+TCP_SOCKET_BUFFER_BYTES = 4096
+
 
 LOG_PREFIX = "CATS_sim"
+
+# --- Profiling ---
+# Set CATS_PROFILE=1 (or pass profile=True to the transports) to record per-stage timings
+PROFILE_ENV_VAR = "CATS_PROFILE"
@@ -0,0 +1,81 @@
+# profiler.py
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+import config
+
+_NULL_STAGE = contextlib.nullcontext()
+
+def profiling_requested(flag=None):
+    """An explicit constructor flag wins; otherwise fall back to the CATS_PROFILE env var."""
+    if flag is not None:
+        return bool(flag)
+    return os.environ.get(config.PROFILE_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+class StageProfiler:
+    """
+    Opt-in per-stage wall clock timer for the transport hot paths.
+    Stages nest per thread, e.g. "TransportSender;transmit;syscall", and self time is
+    recorded for each stack so the output can be fed straight to flamegraph.pl or speedscope.
+    When disabled, stage() hands back a shared no-op context manager.
+    """
+    def __init__(self, component, enabled=False, filename_prefix=config.LOG_PREFIX):
+        self.component = component
+        self.enabled = enabled
+        self.timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.profile_file_prefix = f"{filename_prefix}_{component}_profile_{self.timestamp}"
+        self._self_ns = defaultdict(int) # {"comp;stage;substage": exclusive ns}
+        self._totals = defaultdict(lambda: [0, 0]) # {stage name: [count, inclusive ns]}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed_stage(name)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = [[self.component, 0]] # [frame name, child ns]
+        stack.append([name, 0])
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            _, child_ns = stack.pop()
+            stack[-1][1] += elapsed
+            path = ";".join(frame for frame, _ in stack) + ";" + name
+            with self._lock:
+                self._self_ns[path] += elapsed - child_ns
+                self._totals[name][0] += 1
+                self._totals[name][1] += elapsed
+
+    def summary(self):
+        with self._lock:
+            return {
+                name: {"count": count, "total_ms": total_ns / 1e6,
+                       "mean_us": total_ns / count / 1e3 if count else 0.0}
+                for name, (count, total_ns) in self._totals.items()
+            }
+
+    def write_output(self):
+        """Write <prefix>.folded (collapsed stacks, microseconds) and <prefix>.json (per-stage summary)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            folded = [f"{path} {ns // 1000}" for path, ns in sorted(self._self_ns.items())]
+        folded_file = f"{self.profile_file_prefix}.folded"
+        with open(folded_file, 'w') as f:
+            f.write("\n".join(folded) + "\n")
+        with open(f"{self.profile_file_prefix}.json", 'w') as f:
+            json.dump({"component": self.component, "stages": self.summary()}, f, indent=2)
+        print(f"Profile written to {folded_file}")
+        return folded_file
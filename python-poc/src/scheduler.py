@@ -0,0 +1,70 @@
+# scheduler.py
+import threading
+from collections import deque
+
+import config
+from segment import Segment, SEGMENT_TYPE_DATA
+
+HIGH_QUEUE_NAME = "HIGH_PRIO_BUF"
+LOW_QUEUE_NAME = "LOW_PRIO_BUF"
+
+def split_app_data(app_data: bytes, priority: int, first_seq_num: int):
+    """Chop application data into DATA segments of at most MAX_SEGMENT_PAYLOAD_SIZE bytes."""
+    segments = []
+    seq_num = first_seq_num
+    for offset in range(0, len(app_data), config.MAX_SEGMENT_PAYLOAD_SIZE):
+        payload_chunk = app_data[offset:offset + config.MAX_SEGMENT_PAYLOAD_SIZE]
+        segments.append(Segment(type=SEGMENT_TYPE_DATA,
+                                priority=priority,
+                                seq_num=seq_num,
+                                payload=payload_chunk))
+        seq_num += 1
+    return segments
+
+class PriorityScheduler:
+    """
+    Strict-priority queueing shared by every transport backend.
+    The scheduler only decides *which* segment goes next; getting it onto the wire
+    (and keeping it reliable) is the backend's job.
+    """
+    def __init__(self):
+        self.send_buffer_high = deque()
+        self.send_buffer_low = deque()
+        self._cond = threading.Condition() # Several TCP writers may dequeue concurrently
+
+    def enqueue(self, segment):
+        with self._cond:
+            if segment.priority == config.HIGH_PRIORITY:
+                self.send_buffer_high.append(segment)
+            else:
+                self.send_buffer_low.append(segment)
+            self._cond.notify()
+
+    def requeue_front(self, segments):
+        """Put segments (e.g. retransmits) at the head of the high priority queue, preserving their order."""
+        with self._cond:
+            for seg in reversed(segments): # Add to front, so process oldest first
+                self.send_buffer_high.appendleft(seg)
+            self._cond.notify(len(segments))
+
+    def dequeue(self, timeout=0):
+        """
+        Pop the next segment to send, waiting up to `timeout` seconds for one to arrive.
+        Returns (segment, source_queue_name), or (None, "") if nothing is queued.
+        """
+        with self._cond:
+            if timeout and not self.has_pending():
+                self._cond.wait(timeout)
+            if self.send_buffer_high:
+                return self.send_buffer_high.popleft(), HIGH_QUEUE_NAME
+            if self.send_buffer_low:
+                return self.send_buffer_low.popleft(), LOW_QUEUE_NAME
+            return None, ""
+
+    def has_pending(self):
+        return bool(self.send_buffer_high or self.send_buffer_low)
+
+    def wake_all(self):
+        """Release any threads blocked in dequeue(), used on shutdown."""
+        with self._cond:
+            self._cond.notify_all()
@@ -0,0 +1,215 @@
+# tcp_transport.py
+import socket
+import struct
+import time
+import threading
+
+import config
+from segment import Segment, SEGMENT_TYPE_DATA
+from scheduler import PriorityScheduler, split_app_data
+
+# Segments are length-prefixed on the stream: [4-byte big-endian length][Segment.to_bytes()]
+FRAME_HEADER = struct.Struct("!I")
+
+def send_frame(sock, segment):
+    data = segment.to_bytes()
+    sock.sendall(FRAME_HEADER.pack(len(data)) + data)
+
+class BottleneckPacer:
+    """
+    Token-style pacer standing in for the bottleneck link on the TCP backends.
+    The receiver drains frames at `bandwidth_sps`, so backpressure builds up in the
+    kernel socket buffers exactly where real TCP would hold it (FIFO, below the scheduler).
+    """
+    def __init__(self, bandwidth_sps):
+        self.time_per_segment = 1.0 / bandwidth_sps if bandwidth_sps > 0 else 0
+        self.next_slot = time.time()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            slot = max(time.time(), self.next_slot)
+            self.next_slot = slot + self.time_per_segment
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+class TCPTransportSender:
+    """
+    Sends CATS segments over one or more TCP connections.
+    With num_connections=1 this is the FIFO TCP baseline: the scheduler only orders frames
+    before they enter the socket buffer. With num_connections>1 it models HTTP/1.1-style
+    parallel connections, where each idle connection takes the next highest priority frame.
+    """
+    def __init__(self, remote_ip=config.RECEIVER_IP, remote_port=config.RECEIVER_PORT,
+                 logger=None, num_connections=1):
+        self.logger = logger
+        if self.logger:
+            self.logger.initialize_sender_log()
+        self.remote_addr = (remote_ip, remote_port)
+        self.num_connections = num_connections
+        self.socks = []
+
+        self.scheduler = PriorityScheduler()
+        self.next_seq_num = 0
+        self._seq_lock = threading.Lock()
+
+        self.running = True
+        self.writer_threads = [
+            threading.Thread(target=self._sending_logic, args=(i,), daemon=True)
+            for i in range(num_connections)
+        ]
+
+    def start(self):
+        for _ in range(self.num_connections):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Frames are small, don't let Nagle batch them
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, config.TCP_SOCKET_BUFFER_BYTES)
+            sock.connect(self.remote_addr)
+            self.socks.append(sock)
+        for t in self.writer_threads:
+            t.start()
+        print(f"TCP sender transport started. {self.num_connections} connection(s) to {self.remote_addr}")
+
+    def stop(self):
+        self.running = False
+        self.scheduler.wake_all()
+        for sock in self.socks:
+            try:
+                sock.shutdown(socket.SHUT_RDWR) # Unblocks a writer stuck in sendall()
+            except OSError:
+                pass
+        for t in self.writer_threads:
+            if t.is_alive():
+                t.join(timeout=1)
+        for sock in self.socks:
+            sock.close()
+        print("TCP sender transport stopped.")
+
+    def send_data(self, app_data: bytes, priority: int):
+        with self._seq_lock:
+            segments = split_app_data(app_data, priority, self.next_seq_num)
+            self.next_seq_num += len(segments)
+        if not segments:
+            return
+        for segment in segments:
+            self.scheduler.enqueue(segment)
+        if self.logger:
+            segment = segments[-1]
+            self.logger.log_sender_event(
+                "APP_QUEUE", segment.seq_num, segment.priority, len(segment.payload),
+                info=f"Data queued by app (orig size: {len(app_data)})"
+            )
+
+    def _sending_logic(self, conn_index):
+        sock = self.socks[conn_index]
+        while self.running:
+            segment_to_send, source_queue_name = self.scheduler.dequeue(timeout=config.SENDER_LOOP_INTERVAL)
+            if not segment_to_send:
+                continue
+            try:
+                send_frame(sock, segment_to_send) # Blocks while the kernel buffer is full
+                if self.logger:
+                    self.logger.log_sender_event(
+                        "SENT_NEW", segment_to_send.seq_num, segment_to_send.priority, len(segment_to_send.payload),
+                        queue_source=source_queue_name, info=f"conn={conn_index}"
+                    )
+            except OSError as e:
+                if self.running:
+                    print(f"Error sending segment on connection {conn_index}: {e}")
+                break
+
+class TCPTransportReceiver:
+    """Accepts any number of TCP connections and hands reassembled segments to the application."""
+    def __init__(self, local_ip="0.0.0.0", local_port=config.RECEIVER_PORT, logger=None,
+                 bandwidth_sps=config.SIMULATED_BANDWIDTH_SPS):
+        self.logger = logger
+        if self.logger:
+            self.logger.initialize_receiver_log()
+        self.listen_addr = (local_ip, local_port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, config.TCP_SOCKET_BUFFER_BYTES) # Inherited by accepted sockets
+        self.sock.bind(self.listen_addr)
+        self.sock.listen()
+        self.sock.settimeout(0.1) # So the accept loop notices stop()
+
+        self.pacer = BottleneckPacer(bandwidth_sps)
+        self.running = True
+        self.receive_thread = threading.Thread(target=self._accept_connections, daemon=True)
+        self.conn_threads = []
+
+        self.on_data_received_callback = None # Application callback
+
+    def set_data_callback(self, callback):
+        self.on_data_received_callback = callback
+
+    def start(self):
+        self.receive_thread.start()
+        print(f"TCP receiver transport started. Listening on {self.listen_addr}")
+
+    def stop(self):
+        self.running = False
+        if self.receive_thread.is_alive():
+            self.receive_thread.join(timeout=1)
+        for t in self.conn_threads:
+            if t.is_alive():
+                t.join(timeout=1)
+        self.sock.close()
+        print("TCP receiver transport stopped.")
+
+    def _accept_connections(self):
+        while self.running:
+            try:
+                conn, sender_addr = self.sock.accept()
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if self.running:
+                    print(f"Socket error in TCP receiver: {e}")
+                break
+            conn.settimeout(0.1)
+            t = threading.Thread(target=self._receive_data, args=(conn, sender_addr), daemon=True)
+            self.conn_threads.append(t)
+            t.start()
+
+    def _recv_exact(self, conn, num_bytes):
+        buf = b''
+        while len(buf) < num_bytes:
+            try:
+                chunk = conn.recv(num_bytes - len(buf))
+            except socket.timeout:
+                if not self.running:
+                    return None
+                continue
+            if not chunk: # Peer closed the connection
+                return None
+            buf += chunk
+        return buf
+
+    def _receive_data(self, conn, sender_addr):
+        try:
+            while self.running:
+                header = self._recv_exact(conn, FRAME_HEADER.size)
+                if header is None:
+                    break
+                data = self._recv_exact(conn, FRAME_HEADER.unpack(header)[0])
+                if data is None:
+                    break
+                self.pacer.wait() # Drain at the bottleneck rate
+
+                segment = Segment.from_bytes(data)
+                if segment and segment.type == SEGMENT_TYPE_DATA:
+                    if self.logger:
+                        self.logger.log_receiver_event(
+                            "DATA_RX", segment.seq_num, segment.priority, len(segment.payload),
+                            sender_addr_str=str(sender_addr),
+                            info=""
+                        )
+                    if self.on_data_received_callback:
+                        self.on_data_received_callback(segment.payload, segment.priority, segment.seq_num)
+        except OSError as e:
+            if self.running:
+                print(f"Socket error in TCP receiver connection {sender_addr}: {e}")
+        finally:
+            conn.close()
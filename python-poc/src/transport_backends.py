@@ -0,0 +1,31 @@
+# transport_backends.py
+import config
+from transport_sender import TransportSender
+from transport_receiver import TransportReceiver
+from tcp_transport import TCPTransportSender, TCPTransportReceiver
+
+BACKEND_UDP = "udp"               # CATS reliability layer over UDP (paced at the sender)
+BACKEND_TCP = "tcp"               # One TCP connection, priority only in app-level framing
+BACKEND_PARALLEL_TCP = "tcp_parallel" # N TCP connections sharing one priority queue
+
+BACKENDS = (BACKEND_UDP, BACKEND_TCP, BACKEND_PARALLEL_TCP)
+
+def create_sender(backend=config.TRANSPORT_BACKEND, logger=None,
+                  bandwidth_sps=config.SIMULATED_BANDWIDTH_SPS,
+                  num_connections=config.PARALLEL_TCP_CONNECTIONS):
+    if backend == BACKEND_UDP:
+        return TransportSender(logger=logger, bandwidth_sps=bandwidth_sps)
+    if backend == BACKEND_TCP:
+        return TCPTransportSender(logger=logger, num_connections=1)
+    if backend == BACKEND_PARALLEL_TCP:
+        return TCPTransportSender(logger=logger, num_connections=num_connections)
+    raise ValueError(f"Unknown transport backend '{backend}'. Choose from {BACKENDS}")
+
+def create_receiver(backend=config.TRANSPORT_BACKEND, logger=None,
+                    bandwidth_sps=config.SIMULATED_BANDWIDTH_SPS):
+    if backend == BACKEND_UDP:
+        return TransportReceiver(logger=logger)
+    if backend in (BACKEND_TCP, BACKEND_PARALLEL_TCP):
+        # The TCP backends simulate the bottleneck on the receive side, see BottleneckPacer
+        return TCPTransportReceiver(logger=logger, bandwidth_sps=bandwidth_sps)
+    raise ValueError(f"Unknown transport backend '{backend}'. Choose from {BACKENDS}")
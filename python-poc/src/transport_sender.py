@@ -2,24 +2,27 @@
 import socket
 import time
 import threading
-from collections import deque
 
 import config
-from segment import Segment, SEGMENT_TYPE_DATA, SEGMENT_TYPE_ACK
+from segment import Segment, SEGMENT_TYPE_ACK
+from scheduler import PriorityScheduler, split_app_data
+from profiler import StageProfiler, profiling_requested
 
 class TransportSender:
     def __init__(self, local_ip="0.0.0.0", local_port=config.SENDER_PORT,
-                 remote_ip=config.RECEIVER_IP, remote_port=config.RECEIVER_PORT, logger=None):
+                 remote_ip=config.RECEIVER_IP, remote_port=config.RECEIVER_PORT, logger=None,
+                 bandwidth_sps=config.SIMULATED_BANDWIDTH_SPS, profile=None):
         self.logger = logger # Add logger parameter
-        self.logger.initialize_sender_log()
+        if self.logger:
+            self.logger.initialize_sender_log()
+        self.profiler = StageProfiler("TransportSender", enabled=profiling_requested(profile))
         self.remote_addr = (remote_ip, remote_port)
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock.bind((local_ip, local_port))
         self.sock.settimeout(0.01) # Non-blocking for ACK reception
 
-        self.send_buffer_high = deque()
-        self.send_buffer_low = deque()
+        self.scheduler = PriorityScheduler()
         
         self.next_seq_num = 0
         self.unacked_segments = {} # {seq_num: (segment, send_time, retries)}
@@ -27,8 +30,8 @@ class TransportSender:
         self.in_flight_count = 0 # Number of unacknowledged segments
 
         # Bandwidth simulation
-        self.simulated_bandwidth_sps = config.SIMULATED_BANDWIDTH_SPS
-        self.time_per_segment = 1.0 / self.simulated_bandwidth_sps if self.simulated_bandwidth_sps > 0 else float('inf')
+        self.simulated_bandwidth_sps = bandwidth_sps
+        self.time_per_segment = 1.0 / self.simulated_bandwidth_sps if self.simulated_bandwidth_sps > 0 else 0 # <= 0 means unpaced, as in BottleneckPacer
         self.last_send_time = time.time()
 
         self.running = True
@@ -48,46 +51,41 @@ class TransportSender:
         if self.sending_logic_thread.is_alive():
             self.sending_logic_thread.join(timeout=1)
         self.sock.close()
+        self.profiler.write_output()
         print("Sender transport stopped.")
 
     def send_data(self, app_data: bytes, priority: int):
-        offset = 0
-        segments_created_count = 0
-        while offset < len(app_data):
-            payload_chunk = app_data[offset:offset + config.MAX_SEGMENT_PAYLOAD_SIZE]
-            segment = Segment(type=SEGMENT_TYPE_DATA,
-                              priority=priority,
-                              seq_num=self.next_seq_num,
-                              payload=payload_chunk)
-            
-            if priority == config.HIGH_PRIORITY:
-                self.send_buffer_high.append(segment)
-            else:
-                self.send_buffer_low.append(segment)
-            
-            self.next_seq_num += 1
-            offset += config.MAX_SEGMENT_PAYLOAD_SIZE
-            segments_created_count +=1
-        # print(f"[Sender App->Transport] Queued {segments_created_count} segments (Prio:{priority}) for data size: {len(app_data)}")
+        with self.profiler.stage("scheduling"):
+            segments = split_app_data(app_data, priority, self.next_seq_num)
+            if not segments:
+                return
+            for segment in segments:
+                self.scheduler.enqueue(segment)
+            self.next_seq_num += len(segments)
+        # print(f"[Sender App->Transport] Queued {len(segments)} segments (Prio:{priority}) for data size: {len(app_data)}")
+        self._log_event(
+            "APP_QUEUE", segment.seq_num, segment.priority, len(segment.payload),
+            info=f"Data queued by app (orig size: {len(app_data)})"
+        )
+
+    def _log_event(self, *args, **kwargs):
         if self.logger:
-                self.logger.log_sender_event(
-                    "APP_QUEUE", segment.seq_num, segment.priority, len(segment.payload),
-                    info=f"Data queued by app (orig size: {len(app_data)})"
-            )
+            with self.profiler.stage("logging"):
+                self.logger.log_sender_event(*args, **kwargs)
 
 
     def _listen_for_acks(self):
         while self.running:
             try:
                 data, _ = self.sock.recvfrom(1024)
-                ack_segment = Segment.from_bytes(data)
+                with self.profiler.stage("serialization"):
+                    ack_segment = Segment.from_bytes(data)
                 if ack_segment and ack_segment.type == SEGMENT_TYPE_ACK:
                     # print(f"[Transport Sender] RX ACK: {ack_segment.ack_num}")
-                    if self.logger:
-                        self.logger.log_sender_event(
-                            "ACK_RX", ack_segment.ack_num, None, 0, # No priority for ACK itself
-                            cwnd=self.current_cwnd, in_flight=self.in_flight_count,
-                            info="Segment ACKed"
+                    self._log_event(
+                        "ACK_RX", ack_segment.ack_num, None, 0, # No priority for ACK itself
+                        cwnd=self.current_cwnd, in_flight=self.in_flight_count,
+                        info="Segment ACKed"
                     )
                     if ack_segment.ack_num in self.unacked_segments:
                         del self.unacked_segments[ack_segment.ack_num]
@@ -113,11 +111,10 @@ class TransportSender:
             if now - send_time > config.ACK_TIMEOUT:
                 if retries < config.MAX_RETRIES:
                     print(f"[Transport Sender] Timeout for segment {seq_num}. Marking for Retransmit (Attempt {retries+1}).")
-                    if self.logger:
-                        self.logger.log_sender_event(
-                            "MARK_RETRANSMIT", segment.seq_num, segment.priority, len(segment.payload),
-                            retry_attempt=retries + 1, cwnd=self.current_cwnd, in_flight=self.in_flight_count,
-                            info="Timeout"
+                    self._log_event(
+                        "MARK_RETRANSMIT", segment.seq_num, segment.priority, len(segment.payload),
+                        retry_attempt=retries + 1, cwnd=self.current_cwnd, in_flight=self.in_flight_count,
+                        info="Timeout"
                     )
                     # Don't resend immediately, let the main sending logic pick it up with priority
                     # For simplicity, we'll re-queue it with high priority to ensure it's considered soon.
@@ -128,13 +125,12 @@ class TransportSender:
                     self.unacked_segments[seq_num] = (segment, now, retries + 1) # Update send_time and retries
                 else:
                     print(f"[Transport Sender] Max retries for segment {seq_num}. Giving up.")
-                    if self.logger:
-                        self.logger.log_sender_event(
-                            "DROP_MAX_RETRY", seq_num, self.unacked_segments[seq_num][0].priority, # Get prio from stored seg
-                            len(self.unacked_segments[seq_num][0].payload),
-                            retry_attempt=config.MAX_RETRIES, cwnd=self.current_cwnd, in_flight=self.in_flight_count,
-                            info="Max retries reached"
-                        )
+                    self._log_event(
+                        "DROP_MAX_RETRY", seq_num, self.unacked_segments[seq_num][0].priority, # Get prio from stored seg
+                        len(self.unacked_segments[seq_num][0].payload),
+                        retry_attempt=config.MAX_RETRIES, cwnd=self.current_cwnd, in_flight=self.in_flight_count,
+                        info="Max retries reached"
+                    )
                     del self.unacked_segments[seq_num]
                     self.in_flight_count = max(0, self.in_flight_count - 1)
                     # Basic CWND reduction on "loss"
@@ -142,8 +138,8 @@ class TransportSender:
                     print(f"[Transport Sender] Assumed loss for {seq_num}. CWND reduced to {self.current_cwnd}")
         
         # Add segments marked for retransmission to the front of the high priority queue
-        for seg in reversed(segments_to_retransmit): # Add to front, so process oldest retransmit first
-            self.send_buffer_high.appendleft(seg)
+        if segments_to_retransmit:
+            self.scheduler.requeue_front(segments_to_retransmit)
 
 
     def _sending_logic(self):
@@ -151,7 +147,8 @@ class TransportSender:
             now = time.time()
 
             # Handle potential retransmissions by re-queueing them
-            self._handle_retransmissions()
+            with self.profiler.stage("scheduling"):
+                self._handle_retransmissions()
 
             # Pacing: Can we send based on bandwidth?
             if now - self.last_send_time < self.time_per_segment:
@@ -165,58 +162,57 @@ class TransportSender:
                 time.sleep(config.SENDER_LOOP_INTERVAL) # Wait for ACKs
                 continue
 
-            segment_to_send = None
-            source_queue_name = ""
-
             # Prioritize sending
-            if self.send_buffer_high:
-                segment_to_send = self.send_buffer_high.popleft()
-                source_queue_name = "HIGH_PRIO_BUF"
-            elif self.send_buffer_low:
-                segment_to_send = self.send_buffer_low.popleft()
-                source_queue_name = "LOW_PRIO_BUF"
+            with self.profiler.stage("scheduling"):
+                segment_to_send, source_queue_name = self.scheduler.dequeue()
 
             if segment_to_send:
-                try:
-                    # If it's a new segment (not a retransmit already in unacked_segments with updated retry count)
-                    # or if it's a retransmit being picked from queue
-                    is_retransmit_from_queue = False
-                    if segment_to_send.seq_num in self.unacked_segments:
-                        # This means it was re-queued by _handle_retransmissions
-                        # We use its existing retry count
-                        _, _, retries = self.unacked_segments[segment_to_send.seq_num]
-                        if retries > 0: # If retries > 0, it's a retransmit from queue
-                             is_retransmit_from_queue = True
-                             # print(f"[Transport Sender->Network] Resending from Q: {segment_to_send} (from {source_queue_name}, Attempt {retries})")
-
-                    self.sock.sendto(segment_to_send.to_bytes(), self.remote_addr)
-                    self.last_send_time = time.time() # Update last send time for pacing
-                    
-                    if not is_retransmit_from_queue: # Don't double print for retransmits from queue
-                        print(f"[Transport Sender->Network] Sent: {segment_to_send} (from {source_queue_name})")
-                    
-                    event_type = "SENT_RETRANSMIT" if is_retransmit_from_queue else "SENT_NEW"
-                    retry_val = self.unacked_segments[segment_to_send.seq_num][2] if segment_to_send.seq_num in self.unacked_segments else 0
-
-                    if self.logger:
-                        self.logger.log_sender_event(
-                            event_type, segment_to_send.seq_num, segment_to_send.priority, len(segment_to_send.payload),
-                            queue_source=source_queue_name, cwnd=self.current_cwnd, in_flight=self.in_flight_count + 1, # +1 because it's about to be in flight
-                            retry_attempt=retry_val,
-                            info=""
-                        )
-                    
-                    # Add/Update in unacked_segments only if it's not already there with a higher retry count (from immediate resend logic)
-                    # Or if it's a genuinely new send
-                    if segment_to_send.seq_num not in self.unacked_segments or not is_retransmit_from_queue :
-                        self.unacked_segments[segment_to_send.seq_num] = (segment_to_send, self.last_send_time, 0 if not is_retransmit_from_queue else retries) # Store original segment for potential later retransmit
-                        self.in_flight_count += 1
-                    
-                    # print(f"[Transport Sender] In-flight: {self.in_flight_count}, CWND: {self.current_cwnd}")
-
-                except Exception as e:
-                    print(f"Error sending segment: {e}")
-                    # Re-add to front of its queue if send fails? For simplicity, we don't here.
+                with self.profiler.stage("transmit"):
+                    self._transmit_segment(segment_to_send, source_queue_name)
             else:
                 # No data to send, sleep for a bit
-                time.sleep(config.SENDER_LOOP_INTERVAL)
\ No newline at end of file
+                time.sleep(config.SENDER_LOOP_INTERVAL)
+
+    def _transmit_segment(self, segment_to_send, source_queue_name):
+        try:
+            # If it's a new segment (not a retransmit already in unacked_segments with updated retry count)
+            # or if it's a retransmit being picked from queue
+            is_retransmit_from_queue = False
+            if segment_to_send.seq_num in self.unacked_segments:
+                # This means it was re-queued by _handle_retransmissions
+                # We use its existing retry count
+                _, _, retries = self.unacked_segments[segment_to_send.seq_num]
+                if retries > 0: # If retries > 0, it's a retransmit from queue
+                     is_retransmit_from_queue = True
+                     # print(f"[Transport Sender->Network] Resending from Q: {segment_to_send} (from {source_queue_name}, Attempt {retries})")
+
+            with self.profiler.stage("serialization"):
+                segment_bytes = segment_to_send.to_bytes()
+            with self.profiler.stage("syscall"):
+                self.sock.sendto(segment_bytes, self.remote_addr)
+            self.last_send_time = time.time() # Update last send time for pacing
+            
+            if not is_retransmit_from_queue: # Don't double print for retransmits from queue
+                print(f"[Transport Sender->Network] Sent: {segment_to_send} (from {source_queue_name})")
+            
+            event_type = "SENT_RETRANSMIT" if is_retransmit_from_queue else "SENT_NEW"
+            retry_val = self.unacked_segments[segment_to_send.seq_num][2] if segment_to_send.seq_num in self.unacked_segments else 0
+
+            self._log_event(
+                event_type, segment_to_send.seq_num, segment_to_send.priority, len(segment_to_send.payload),
+                queue_source=source_queue_name, cwnd=self.current_cwnd, in_flight=self.in_flight_count + 1, # +1 because it's about to be in flight
+                retry_attempt=retry_val,
+                info=""
+            )
+            
+            # Add/Update in unacked_segments only if it's not already there with a higher retry count (from immediate resend logic)
+            # Or if it's a genuinely new send
+            if segment_to_send.seq_num not in self.unacked_segments or not is_retransmit_from_queue :
+                self.unacked_segments[segment_to_send.seq_num] = (segment_to_send, self.last_send_time, 0 if not is_retransmit_from_queue else retries) # Store original segment for potential later retransmit
+                self.in_flight_count += 1
+            
+            # print(f"[Transport Sender] In-flight: {self.in_flight_count}, CWND: {self.current_cwnd}")
+
+        except Exception as e:
+            print(f"Error sending segment: {e}")
+            # Re-add to front of its queue if send fails? For simplicity, we don't here.
\ No newline at end of file